@@ -33,11 +33,10 @@ Main code for cli.
 
 import logging
 import os
+import sys
 from datetime import datetime
 
-from colorclass import Windows
-from yaspin import yaspin
-
+from lastpassreportingcli.library import environment_variable_boolean
 from lastpassreportingcli.lastpassreportingcli import (get_arguments,
                                                        setup_logging,
                                                        authenticate_lastpass,
@@ -60,6 +59,9 @@ LOGGER_BASENAME = '''cli'''
 LOGGER = logging.getLogger(LOGGER_BASENAME)
 LOGGER.addHandler(logging.NullHandler())
 
+# The day of the lastpass incident. Kept naive since lastpasslib reports secret dates as naive local datetimes.
+CUTOFF_DATE = datetime(2022, 9, 22)
+
 
 def main():
     """
@@ -69,10 +71,23 @@ def main():
     the script is run on command line.
     """
     args = get_arguments()
+    # Terminal dependencies are only imported after the arguments are parsed so "--help" and argument errors stay fast.
+    # pylint: disable=import-outside-toplevel
+    from yaspin import yaspin
     setup_logging(args.log_level, args.logger_config)
-    os.system('CLS' if os.name == 'nt' else 'clear')
-    Windows.enable(auto_colors=True, reset_atexit=True)  # Configures colors on Windows, does nothing if not on Windows.
-    cutoff_date = datetime.fromisoformat('2022-09-22')
+    streams_wrapped = False
+    if os.name == 'nt':
+        from colorclass import Windows
+        # Returns True only when the console has no native ANSI support and colorclass wrapped the streams.
+        streams_wrapped = Windows.enable(auto_colors=True, reset_atexit=True)
+    if sys.stdout.isatty() and not environment_variable_boolean(os.environ.get('LASTPASS_NO_CLEAR_SCREEN', False)):
+        if streams_wrapped:
+            # The colorclass stream only translates colour codes so the console has to clear the screen itself.
+            os.system('cls')
+        else:
+            # Clears the screen and moves the cursor home with ANSI escapes instead of spawning a "clear" process.
+            sys.stdout.write('\x1b[2J\x1b[H')
+            sys.stdout.flush()
     lastpass = authenticate_lastpass(args.username, args.password, args.mfa)
     with yaspin(text='Please wait while retrieving and decrypting secrets from Lastpass...',
                 color='yellow') as spinner:
@@ -80,15 +95,15 @@ def main():
         lastpass.decrypted_vault.secrets = secrets
     spinner.ok("✅")
     if args.secret_whitelist:
-        LOGGER.info(f'Will be disregarding secrets with ids : {args.secret_whitelist}')
-    if hasattr(args, 'filename'):
+        LOGGER.info(f'Will be disregarding secrets with ids : {sorted(args.secret_whitelist)}')
+    if args.command == 'export':
         return export_secret_state(lastpass.folders,
                                    args.filename,
-                                   cutoff_date,
+                                   CUTOFF_DATE,
                                    args.warning_whitelist)
     folder_metrics = get_folder_metrics(secrets,
                                         lastpass.folders,
-                                        cutoff_date,
+                                        CUTOFF_DATE,
                                         args.warning_whitelist,
                                         args.details,
                                         args.filter_folders)
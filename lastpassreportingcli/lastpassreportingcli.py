@@ -37,11 +37,7 @@ import json
 import logging
 import logging.config
 import os
-
-import coloredlogs
-from lastpasslib import Lastpass, UnknownUsername, InvalidPassword, InvalidMfa, MfaRequired
-from lastpasslib.datamodels import Folder
-from terminaltables import SingleTable
+from operator import attrgetter
 
 from .library import (FolderMetrics,
                       PresentationFolder,
@@ -49,8 +45,7 @@ from .library import (FolderMetrics,
                       environment_variable_boolean,
                       get_user_input_or_quit,
                       comma_delimited_list_variable,
-                      validate_secret_ids,
-                      check_args_set)
+                      secret_ids_variable)
 
 __author__ = '''Costas Tyfoxylos <ctyfoxylos@schubergphilis.com>'''
 __docformat__ = '''google'''
@@ -69,6 +64,9 @@ LOGGER.addHandler(logging.NullHandler())
 
 REPORT_ON_CHOICES = ['all', 'personal', 'shared']
 SORT_ON_CHOICES = ['name', 'percentage']
+EXPORT_BUFFER_SIZE = 1024 * 1024
+SECRET_EXPORT_DETAILS = attrgetter('type', 'id', 'name', 'url')
+SECRET_EXPORT_DATES = attrgetter('last_modified_datetime', 'last_touch_datetime', 'last_password_change_datetime')
 
 
 def get_arguments():
@@ -118,17 +116,17 @@ def get_arguments():
                              'provided value will be interactively requested by the user.')
     parser.add_argument('--warning-whitelist',
                         '-w',
-                        default=os.environ.get('LASTPASS_WARNING_WHITELIST', []),
-                        type=comma_delimited_list_variable,
+                        default=os.environ.get('LASTPASS_WARNING_WHITELIST', ''),
+                        type=secret_ids_variable,
                         help='A comma delimited list of secret IDs that will be disregarded from the reports for '
                              'warnings. Environment variable "LASTPASS_WARNING_WHITELIST" can be set.')
     parser.add_argument('--secret-whitelist',
                         '-sw',
-                        default=os.environ.get('LASTPASS_SECRET_WHITELIST', []),
-                        type=comma_delimited_list_variable,
+                        default=os.environ.get('LASTPASS_SECRET_WHITELIST', ''),
+                        type=secret_ids_variable,
                         help='A comma delimited list of secret IDs that will be completely disregarded from the '
                              'reports. Environment variable "LASTPASS_SECRET_WHITELIST" can be set.')
-    subparsers = parser.add_subparsers(help='Supported functions for this program.')
+    subparsers = parser.add_subparsers(dest='command', help='Supported functions for this program.')
     report = subparsers.add_parser('report', help='Arguments for reporting on the current state of secret rotation.')
     export = subparsers.add_parser('export', help='Arguments for export all secret rotation state for processing.')
     report.add_argument('--report-on',
@@ -170,17 +168,10 @@ def get_arguments():
                         action=default_environment_variable('LASTPASS_EXPORT_FILENAME'),
                         required=True)
     args = parser.parse_args()
-    are_valid, warning_whitelist = validate_secret_ids(args.warning_whitelist)
-    if not are_valid:
-        parser.error(f'{warning_whitelist} are not valid ids.')
-    are_valid, secret_whitelist = validate_secret_ids(args.secret_whitelist)
-    if not are_valid:
-        parser.error(f'{secret_whitelist} are not valid ids.')
-    report_mode = check_args_set(args, ('report_on', 'sort_on', 'reverse_sort', 'details', 'filter_folders'))
-    export_mode = check_args_set(args, ('filename',))
-    if not any((report_mode, export_mode)):
+    if args.command is None:
         parser.error('Please specify one of "report" or "export" as the first argument.')
-    if report_mode:
+    # Values coming from environment variables are not checked by argparse against the choices.
+    if args.command == 'report':
         if args.report_on not in REPORT_ON_CHOICES:
             parser.error(f'Only {REPORT_ON_CHOICES} are valid choices for "LASTPASS_REPORT_ON" variable.')
         if args.sort_on not in SORT_ON_CHOICES:
@@ -214,54 +205,62 @@ def setup_logging(level, config_file=None):
             print(f'File "{config_file}" is not valid json, cannot continue.')
             raise SystemExit(1) from None
     else:
+        import coloredlogs  # pylint: disable=import-outside-toplevel
         coloredlogs.install(level=level.upper())
 
 
 # pylint: disable=too-many-arguments
 def get_folder_metrics(secrets, folders, cutoff_date, warning_whitelist, details, filter_folders):
     if not details:
-        shared_secrets = [secret for secret in secrets if secret.shared_folder]
-        personal_secrets = [secret for secret in secrets if not secret.shared_folder]
+        from lastpasslib.datamodels import Folder  # pylint: disable=import-outside-toplevel
         aggregate_root_folders = {folder.full_path: Folder(folder.name, folder.path,
                                                            is_personal=folder.is_personal)
                                   for folder in folders if folder.is_in_root}
-        for secret in shared_secrets:
-            aggregate_root_folders[secret.shared_folder.shared_name].add_secret(secret)
-        aggregate_root_folders['\\'].add_secrets(personal_secrets)
+        personal_root_folder = aggregate_root_folders['\\']
+        for secret in secrets:
+            shared_folder = secret.shared_folder
+            root_folder = aggregate_root_folders[shared_folder.shared_name] if shared_folder else personal_root_folder
+            root_folder.add_secret(secret)
         folders = aggregate_root_folders.values()
-    if filter_folders:
-        folders = [folder for folder in folders if folder.full_path.startswith(tuple(filter_folders))]
-    metrics = sorted([FolderMetrics(folder, cutoff_date, warning_whitelist) for folder in folders],
-                     key=lambda x: x.full_path)
+    prefixes = tuple(filter_folders or ())
+    metrics = [FolderMetrics(folder, cutoff_date, warning_whitelist) for folder in folders
+               if not prefixes or folder.full_path.startswith(prefixes)]
+    metrics.sort(key=attrgetter('full_path'))
     return metrics
 
 
 def final_report_data(folder_metrics):
-    total_secrets = sum(folder.number_of_secrets for folder in folder_metrics)
-    total_updated_secrets = sum(folder.number_of_updated_secrets for folder in folder_metrics)
+    total_secrets = total_updated_secrets = 0
+    for folder in folder_metrics:
+        total_secrets += folder.number_of_secrets
+        total_updated_secrets += folder.number_of_updated_secrets
     total_left_to_update = total_secrets - total_updated_secrets
-    percent_done = total_updated_secrets / total_secrets * 100
+    percent_done = total_updated_secrets / total_secrets * 100 if total_secrets else 100
     percent_left = 100 - percent_done
     return (f'There are {total_secrets} artifacts in {len(folder_metrics)} folders. '
             f'{total_updated_secrets} ({percent_done:0.2f}%) artifacts have been updated and {total_left_to_update} '
             f'({percent_left:0.2f}%) still need attention')
 
 
-def create_report(folder_metrics, report_on, sort_on, reverse_sort):
-    headers = ('Path', 'Percentage Done', '(Updated/Total) Still left', 'Warnings')
+def _partition_by_personal(folder_metrics):
+    metrics_per_table = {'personal': [], 'shared': []}
+    for folder in folder_metrics:
+        metrics_per_table['personal' if folder.is_personal else 'shared'].append(folder)
+    return metrics_per_table
 
-    def sort_criteria(folder):
-        return folder.full_path if sort_on == 'name' else folder.percentage_done
 
+def create_report(folder_metrics, report_on, sort_on, reverse_sort):
+    from terminaltables import SingleTable  # pylint: disable=import-outside-toplevel
+    headers = ('Path', 'Percentage Done', '(Updated/Total) Still left', 'Warnings')
+    sort_criteria = attrgetter('full_path' if sort_on == 'name' else 'percentage_done')
     tables = ['personal', 'shared'] if report_on == 'all' else [report_on]
+    metrics_per_table = _partition_by_personal(folder_metrics)
     output = []
     for table in tables:
         table_data = [headers]
-        metrics_data = [folder for folder in folder_metrics
-                        if (folder.is_personal if table == 'personal' else not folder.is_personal)]
+        metrics_data = metrics_per_table[table]
         metrics_data.sort(key=sort_criteria, reverse=reverse_sort)
-        data = [PresentationFolder(folder).presentation_row for folder in metrics_data]
-        table_data.extend(data)
+        table_data.extend(PresentationFolder(folder).presentation_row for folder in metrics_data)
         result = SingleTable(table_data, title=f'Lastpass secret rotation progress - {table.title()}')
         result.inner_heading_row_border = False
         output.append(result)
@@ -269,12 +268,14 @@ def create_report(folder_metrics, report_on, sort_on, reverse_sort):
         print()
         print(entry.table)
         print()
-    metrics = folder_metrics if report_on == 'all' else metrics_data
-    print(final_report_data(metrics))
+    print(final_report_data(folder_metrics if report_on == 'all' else metrics_data))
     return True
 
 
 def authenticate_lastpass(username, password, mfa):
+    # lastpasslib pulls in the crypto and http stack so it is only imported when actually authenticating.
+    # pylint: disable=import-outside-toplevel
+    from lastpasslib import Lastpass, UnknownUsername, InvalidPassword, InvalidMfa, MfaRequired
     username = username or get_user_input_or_quit('username')
     password = password or get_user_input_or_quit('password', password=True)
     mfa = mfa or get_user_input_or_quit('MFA')
@@ -300,28 +301,22 @@ def authenticate_lastpass(username, password, mfa):
 
 
 def create_csv_payload(folders, cutoff_date, warning_whitelist):
-    rows = [('full_path', 'secret_type', 'id', 'name', 'url', 'username', 'last_modified', 'last_touched',
-             'last_password_modified', 'status', 'warning')]
+    yield ('full_path', 'secret_type', 'id', 'name', 'url', 'username', 'last_modified', 'last_touched',
+           'last_password_modified', 'status', 'warning')
+    is_secret_in_warning = FolderMetrics.check_if_is_secret_in_warning
     for folder in folders:
+        full_path = folder.full_path
         for secret in folder.secrets:
-            rows.append((folder.full_path,
-                         secret.type,
-                         secret.id,
-                         secret.name,
-                         secret.url,
-                         secret.username if hasattr(secret, 'username') else secret.type,
-                         secret.last_modified_datetime,
-                         secret.last_touch_datetime,
-                         secret.last_password_change_datetime,
-                         'NOT_OK' if secret.secret_updated_datetime < cutoff_date else 'OK',
-                         FolderMetrics.check_if_is_secret_in_warning(secret,
-                                                                     cutoff_date,
-                                                                     warning_whitelist)))
-    return rows
+            yield (full_path,
+                   *SECRET_EXPORT_DETAILS(secret),
+                   getattr(secret, 'username', secret.type),
+                   *SECRET_EXPORT_DATES(secret),
+                   'NOT_OK' if secret.secret_updated_datetime < cutoff_date else 'OK',
+                   is_secret_in_warning(secret, cutoff_date, warning_whitelist))
 
 
 def export_secret_state(folders, filename, cutoff_date, warning_whitelist):
-    with open(filename, 'w', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile, delimiter=',', quotechar='"', dialect=csv.excel)
+    with open(filename, 'w', encoding='utf-8', newline='', buffering=EXPORT_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile, lineterminator='\n')
         writer.writerows(create_csv_payload(folders, cutoff_date, warning_whitelist))
     raise SystemExit(f'Exported secret data to {filename}.')
@@ -47,6 +47,7 @@ from .validators import (get_user_input_or_quit,
                          default_environment_variable,
                          environment_variable_boolean,
                          validate_secret_ids,
+                         secret_ids_variable,
                          check_args_set)
 
 assert WarningSecret
@@ -57,4 +58,5 @@ assert comma_delimited_list_variable
 assert default_environment_variable
 assert environment_variable_boolean
 assert validate_secret_ids
+assert secret_ids_variable
 assert check_args_set
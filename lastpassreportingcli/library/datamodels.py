@@ -35,11 +35,15 @@ import json
 import logging.config
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Union
 
 from colorclass import Color
-from lastpasslib.datamodels import Folder
-from lastpasslib.secrets import Password, SecureNote
+
+if TYPE_CHECKING:
+    # lastpasslib is only needed for the annotations, importing it at runtime would load its whole crypto stack.
+    from lastpasslib.datamodels import Folder
+    from lastpasslib.secrets import Password, SecureNote
 
 __author__ = '''Costas Tyfoxylos <ctyfoxylos@schubergphilis.com>'''
 __docformat__ = '''google'''
@@ -60,10 +64,15 @@ ERROR_HIGH_PERCENTAGE = 99
 ERROR_LOW_PERCENTAGE = 70
 
 
+def colorize(color, value):
+    return Color(f'{{{color}}}{value}{{/{color}}}')
+
+
 @dataclass
 class WarningSecret:
+    __slots__ = ('folder_name', 'secret')
     folder_name: str
-    secret: Union[Password, SecureNote]
+    secret: 'Union[Password, SecureNote]'
 
     @property
     def to_json(self):
@@ -82,7 +91,7 @@ class WarningSecret:
 
 @dataclass
 class FolderMetrics:
-    folder: Folder
+    folder: 'Folder'
     cutoff_date: datetime
     warning_whitelist: list = field(default_factory=list)
 
@@ -94,7 +103,7 @@ class FolderMetrics:
     def path(self):
         return self.folder.path
 
-    @property
+    @cached_property
     def full_path(self):
         return self.folder.full_path
 
@@ -106,18 +115,29 @@ class FolderMetrics:
     def is_personal(self):
         return self.folder.is_personal
 
+    @cached_property
+    def _rotation_state(self):
+        cutoff_date = self.cutoff_date
+        number_of_updated_secrets = 0
+        warnings = []
+        for secret in self.folder.secrets:
+            if secret.last_modified_datetime > cutoff_date:
+                number_of_updated_secrets += 1
+            if self.is_secret_in_warning(secret):
+                warnings.append(WarningSecret(self.folder.name, secret))
+        return number_of_updated_secrets, tuple(warnings)
+
     @property
     def warnings(self):
-        return [WarningSecret(self.folder.name, secret) for secret in self.folder.secrets
-                if self.is_secret_in_warning(secret)]
+        return self._rotation_state[1]
 
-    @property
+    @cached_property
     def number_of_secrets(self):
         return len(self.folder.secrets)
 
     @property
     def number_of_updated_secrets(self):
-        return len([secret for secret in self.folder.secrets if secret.last_modified_datetime > self.cutoff_date])
+        return self._rotation_state[0]
 
     @property
     def number_of_secrets_to_update(self):
@@ -127,7 +147,7 @@ class FolderMetrics:
     def number_of_warnings(self):
         return len(self.warnings)
 
-    @property
+    @cached_property
     def percentage_done(self):
         if self.number_of_secrets:
             percentage = round(self.number_of_updated_secrets / self.number_of_secrets * 100, 2) or 0
@@ -146,13 +166,12 @@ class FolderMetrics:
 
     @staticmethod
     def check_if_is_secret_in_warning(secret, cutoff_date, warning_whitelist):
-        if all([secret.last_modified_datetime != secret.secret_updated_datetime,
-                secret.secret_updated_datetime < cutoff_date,
-                secret.last_modified_datetime > cutoff_date,
-                secret.type == 'Password' and secret.password != '',
-                secret.id not in warning_whitelist]):
-            return True
-        return False
+        last_modified = secret.last_modified_datetime
+        secret_updated = secret.secret_updated_datetime
+        return (last_modified != secret_updated
+                and secret_updated < cutoff_date < last_modified
+                and secret.type == 'Password' and secret.password != ''
+                and secret.id not in warning_whitelist)
 
     @property
     def is_completed(self):
@@ -183,11 +202,12 @@ class FolderMetrics:
 
 @dataclass
 class PresentationFolder:
+    __slots__ = ('folder',)
     folder: FolderMetrics
 
     @property
     def name(self):
-        return Color(f'{{blue}}{self.folder.full_path}{{/blue}}') if self.folder.is_in_root else self.folder.full_path
+        return colorize('blue', self.folder.full_path) if self.folder.is_in_root else self.folder.full_path
 
     @property
     def is_personal(self):
@@ -207,7 +227,7 @@ class PresentationFolder:
     @property
     def presentation_row(self):
         return (self.name,
-                Color(f'{{{f"{self.percentage_color}"}}}{self.folder.percentage_done}{{{f"{self.percentage_color}"}}}'),
+                colorize(self.percentage_color, self.folder.percentage_done),
                 f'({self.folder.number_of_updated_secrets}/{self.folder.number_of_secrets}) '
                 f'{self.folder.number_of_secrets_to_update} left',
-                Color(f'{{{f"{self.warning_color}"}}}{self.folder.number_of_warnings}{{{f"/{self.warning_color}"}}}'))
+                colorize(self.warning_color, self.folder.number_of_warnings))
@@ -32,10 +32,10 @@ Main code for datamodels.
 """
 
 import argparse
+import getpass
 import logging
 import os
-
-from prompt_toolkit.shortcuts import input_dialog
+import re
 
 __author__ = '''Costas Tyfoxylos <ctyfoxylos@schubergphilis.com>'''
 __docformat__ = '''google'''
@@ -52,23 +52,51 @@ LOGGER_BASENAME = '''validators'''
 LOGGER = logging.getLogger(LOGGER_BASENAME)
 LOGGER.addHandler(logging.NullHandler())
 
+BOOLEAN_TRUE_VALUES = frozenset({True, 't', 'T', 'true', 'True', '1', 'TRUE'})
+BOOLEAN_TRUE_BYTES = frozenset({b't', b'T', b'true', b'True', b'1', b'TRUE'})
+SECRET_ID_PATTERN = re.compile(r'\d{18,19}')
+
 
 def get_user_input_or_quit(variable_name, password=False, title=None):
-    user_input = input_dialog(title=title if title else f'Lastpass {variable_name}',
-                              text=f'Please type your lastpass {variable_name}:',
-                              password=password).run()
+    if title:
+        print(title)
+    prompt = f'Please type your lastpass {variable_name}: '
+    try:
+        user_input = getpass.getpass(prompt) if password else input(prompt)
+    except (EOFError, KeyboardInterrupt):
+        user_input = None
     if not user_input:
         raise SystemExit(f'User canceled or provided an empty value for {variable_name}')
     return user_input
 
 
 def comma_delimited_list_variable(value):
-    """Support for environment variables with comma delimited lists of values."""
-    return value.split(',')
+    """Support for environment variables with comma delimited lists of values, ignoring surrounding whitespace."""
+    return [entry for entry in map(str.strip, value.split(',')) if entry]
+
+
+class DefaultEnvVar(argparse.Action):
+    """Default Environment Variable.
+
+    Subclasses created by default_environment_variable carry the value of their environment variable.
+    """
+
+    __slots__ = ()
+    environment_value = None
+
+    def __init__(self, *args, **kwargs):
+        if self.environment_value is not None:
+            kwargs['default'] = self.environment_value
+        if kwargs.get('required') and kwargs.get('default'):
+            kwargs['required'] = False
+        super().__init__(*args, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, values)
 
 
 def default_environment_variable(variable_name):
-    """Closure to pass the variable name to the inline custom Action.
+    """Binds the value of the environment variable to a DefaultEnvVar Action.
 
     Args:
         variable_name: The variable to look up as environment variable.
@@ -77,44 +105,27 @@ def default_environment_variable(variable_name):
         The Action object.
 
     """
-
-    class DefaultEnvVar(argparse.Action):
-        """Default Environment Variable."""
-
-        def __init__(self, *args, **kwargs):
-            if variable_name in os.environ:
-                kwargs['default'] = os.environ[variable_name]
-            if kwargs.get('required') and kwargs.get('default'):
-                kwargs['required'] = False
-            super().__init__(*args, **kwargs)
-
-        def __call__(self, parser, namespace, values, option_string=None):
-            setattr(namespace, self.dest, values)
-
-    return DefaultEnvVar
+    return type('DefaultEnvVar', (DefaultEnvVar,), {'__slots__': (),
+                                                    'environment_value': os.environ.get(variable_name)})
 
 
 def environment_variable_boolean(value):
     """Parses an environment variable as a boolean.
 
     Args:
-        value: The value of the environment variable.
+        value: The value of the environment variable, either as str or as bytes.
 
     Returns:
         True if environment variable is one of the supported values, False otherwise.
 
     """
-    if value in [True, 't', 'T', 'true', 'True', 1, '1', 'TRUE']:
-        return True
-    return False
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value) in BOOLEAN_TRUE_BYTES
+    return value in BOOLEAN_TRUE_VALUES
 
 
 def is_valid_secret_id(secret_id):
-    try:
-        int(secret_id)
-    except ValueError:
-        return False
-    return 18 <= len(secret_id) <= 19
+    return SECRET_ID_PATTERN.fullmatch(secret_id) is not None
 
 
 def validate_secret_ids(secret_ids):
@@ -124,5 +135,27 @@ def validate_secret_ids(secret_ids):
     return True, secret_ids
 
 
+def secret_ids_variable(value):
+    """Parses a comma delimited list of secret ids, validating them.
+
+    Args:
+        value: The comma delimited list of secret ids.
+
+    Raises:
+        ArgumentTypeError: If any of the provided ids is not a valid secret id.
+
+    Returns:
+        A frozenset of the secret ids.
+
+    """
+    are_valid, secret_ids = validate_secret_ids(comma_delimited_list_variable(value))
+    if not are_valid:
+        raise argparse.ArgumentTypeError(f'{secret_ids} are not valid ids.')
+    return frozenset(secret_ids)
+
+
 def check_args_set(args, arguments):
-    return all((hasattr(args, value) for value in arguments))
+    for argument in arguments:
+        if not hasattr(args, argument):
+            return False
+    return True
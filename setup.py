@@ -3,37 +3,25 @@
 
 from setuptools import setup, find_packages
 
-try:
-    from pipenv.project import Project
-    from pipenv.utils import convert_deps_to_pip
 
-    pfile = Project().parsed_pipfile
-    requirements = convert_deps_to_pip(pfile['packages'], r=False)
-    test_requirements = convert_deps_to_pip(pfile['dev-packages'], r=False)
-except ImportError:
-    # get the requirements from the requirements.txt
-    requirements = [line.strip()
-                    for line in open('requirements.txt').readlines()
-                    if line.strip() and not line.startswith('#')]
-    # get the test requirements from the test_requirements.txt
-    test_requirements = [line.strip()
-                         for line in
-                         open('dev-requirements.txt').readlines()
-                         if line.strip() and not line.startswith('#')]
+def read_requirements(filename):
+    with open(filename, encoding='utf-8') as requirements_file:
+        return [line.strip() for line in requirements_file if line.strip() and not line.startswith('#')]
 
-readme = open('README.rst').read()
-history = open('HISTORY.rst').read().replace('.. :changelog:', '')
-version = open('.VERSION').read()
+
+# get the requirements from the requirements.txt
+requirements = read_requirements('requirements.txt')
+# get the test requirements from the dev-requirements.txt
+test_requirements = read_requirements('dev-requirements.txt')
 
 setup(
     name='''lastpassreportingcli''',
-    version=version,
     description='''A tool to report on state of secret rotation based on a cutoff day, by default the incident of lastpass day.''',
-    long_description=readme + '\n\n' + history,
     author='''Costas Tyfoxylos''',
     author_email='''ctyfoxylos@schubergphilis.com''',
     url='''https://github.com/schubergphilis/lastpassreportingcli''',
     packages=find_packages(where='.', exclude=('tests', 'hooks', '_CI*')),
+    py_modules=['lastpass_report_cli'],
     package_dir={'''lastpassreportingcli''':
                      '''lastpassreportingcli'''},
     include_package_data=True,
@@ -47,7 +35,6 @@ setup(
             #  lastpassreportingcli.lastpassreportingcli:main method
             'lastpass-report = lastpass_report_cli:main'
         ]},
-    scripts=['lastpass_report_cli.py'],
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -33,7 +33,21 @@ Tests for `lastpassreportingcli` module.
 
 """
 
+import io
+import os
+import sys
+from contextlib import redirect_stderr
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
 from betamax.fixtures import unittest
+from colorclass import Color
+
+from lastpass_report_cli import CUTOFF_DATE
+from lastpassreportingcli.lastpassreportingcli import get_arguments, final_report_data, create_csv_payload
+from lastpassreportingcli.library import FolderMetrics, PresentationFolder
 
 __author__ = '''Costas Tyfoxylos <ctyfoxylos@schubergphilis.com>'''
 __docformat__ = '''google'''
@@ -63,3 +77,181 @@ class TestLastpassreportingcli(unittest.BetamaxTestCase):
         This is where you should tear down what you've setup in setUp before. This method is called after every test.
         """
         pass
+
+
+class TestFinalReportData(TestCase):
+
+    def test_no_folders_do_not_divide_by_zero(self):
+        self.assertEqual(final_report_data([]),
+                         'There are 0 artifacts in 0 folders. 0 (100.00%) artifacts have been updated and 0 '
+                         '(0.00%) still need attention')
+
+
+class TestPresentationFolder(TestCase):
+
+    @staticmethod
+    def folder_metrics(**kwargs):
+        defaults = {'full_path': 'Shared-Team',
+                    'is_in_root': True,
+                    'is_personal': False,
+                    'percentage_done': 100,
+                    'number_of_updated_secrets': 2,
+                    'number_of_secrets': 2,
+                    'number_of_secrets_to_update': 0,
+                    'number_of_warnings': 0}
+        defaults.update(kwargs)
+        return SimpleNamespace(**defaults)
+
+    def test_presentation_row_closes_color_tags(self):
+        row = PresentationFolder(self.folder_metrics(percentage_done=50, number_of_warnings=1)).presentation_row
+        name, percentage, _, warnings = row
+        self.assertEqual(name, Color('{blue}Shared-Team{/blue}'))
+        self.assertEqual(percentage, Color('{autored}50{/autored}'))
+        self.assertEqual(warnings, Color('{autoyellow}1{/autoyellow}'))
+        for cell in (name, percentage, warnings):
+            self.assertTrue(cell.value_colors.endswith('\x1b[39m'))
+
+    def test_presentation_row_values_without_colors(self):
+        row = PresentationFolder(self.folder_metrics(is_in_root=False)).presentation_row
+        self.assertEqual(row[0], 'Shared-Team')
+        self.assertEqual([cell.value_no_colors for cell in (row[1], row[3])], ['100', '0'])
+        self.assertEqual(row[2], '(2/2) 0 left')
+
+
+VALID_ID = '123456789012345678'
+OTHER_VALID_ID = '1234567890123456789'
+
+
+def parse_arguments(arguments, environment=None):
+    with patch.object(sys, 'argv', ['lastpass-report', *arguments]), \
+            patch.dict(os.environ, environment or {}, clear=True):
+        return get_arguments()
+
+
+class TestGetArguments(TestCase):
+
+    def test_whitelists_default_to_empty_frozensets(self):
+        args = parse_arguments(['report'])
+        self.assertEqual(args.warning_whitelist, frozenset())
+        self.assertEqual(args.secret_whitelist, frozenset())
+
+    def test_whitelists_from_arguments_are_frozensets(self):
+        args = parse_arguments(['--warning-whitelist', VALID_ID, '--secret-whitelist', OTHER_VALID_ID, 'report'])
+        self.assertEqual(args.warning_whitelist, frozenset({VALID_ID}))
+        self.assertEqual(args.secret_whitelist, frozenset({OTHER_VALID_ID}))
+
+    def test_whitelists_from_environment_are_frozensets(self):
+        args = parse_arguments(['report'], {'LASTPASS_WARNING_WHITELIST': VALID_ID,
+                                            'LASTPASS_SECRET_WHITELIST': OTHER_VALID_ID})
+        self.assertEqual(args.warning_whitelist, frozenset({VALID_ID}))
+        self.assertEqual(args.secret_whitelist, frozenset({OTHER_VALID_ID}))
+
+    def test_trailing_comma_and_spaces_in_whitelist_are_accepted(self):
+        args = parse_arguments(['report'], {'LASTPASS_WARNING_WHITELIST': f'{VALID_ID}, {OTHER_VALID_ID},'})
+        self.assertEqual(args.warning_whitelist, frozenset({VALID_ID, OTHER_VALID_ID}))
+
+    def test_invalid_ids_in_environment_whitelists_are_rejected(self):
+        for variable in ('LASTPASS_WARNING_WHITELIST', 'LASTPASS_SECRET_WHITELIST'):
+            with self.subTest(variable=variable), redirect_stderr(io.StringIO()) as stderr:
+                with self.assertRaises(SystemExit):
+                    parse_arguments(['report'], {variable: f'{VALID_ID},not-an-id'})
+                self.assertIn('not-an-id', stderr.getvalue())
+
+
+BEFORE_CUTOFF = CUTOFF_DATE - timedelta(days=1)
+AFTER_CUTOFF = CUTOFF_DATE + timedelta(days=1)
+
+
+def make_secret(id_, last_modified, secret_updated, type_='Password', password='secret'):
+    return SimpleNamespace(id=id_,
+                           name=f'secret-{id_}',
+                           url='https://example.com',
+                           type=type_,
+                           password=password,
+                           last_modified_datetime=last_modified,
+                           secret_updated_datetime=secret_updated)
+
+
+class TestFolderMetrics(TestCase):
+
+    def setUp(self):
+        self.rotated = make_secret('1', AFTER_CUTOFF, AFTER_CUTOFF)
+        self.not_rotated = make_secret('2', BEFORE_CUTOFF, BEFORE_CUTOFF)
+        self.touched_only = make_secret('3', AFTER_CUTOFF, BEFORE_CUTOFF)
+        self.whitelisted = make_secret('4', AFTER_CUTOFF, BEFORE_CUTOFF)
+        self.touched_note = make_secret('5', AFTER_CUTOFF, BEFORE_CUTOFF, type_='SecureNote', password=None)
+        self.folder = SimpleNamespace(name='Shared-Team',
+                                      full_path='Shared-Team',
+                                      secrets=[self.rotated, self.not_rotated, self.touched_only,
+                                               self.whitelisted, self.touched_note])
+
+    def test_rotation_state(self):
+        metrics = FolderMetrics(self.folder, CUTOFF_DATE, frozenset({self.whitelisted.id}))
+        self.assertEqual(metrics.number_of_secrets, 5)
+        self.assertEqual(metrics.number_of_updated_secrets, 4)
+        self.assertEqual(metrics.number_of_secrets_to_update, 1)
+        self.assertEqual(metrics.percentage_done, 80.0)
+        self.assertEqual(metrics.number_of_warnings, 1)
+        self.assertEqual([warning.secret for warning in metrics.warnings], [self.touched_only])
+
+    def test_warnings_without_whitelist(self):
+        metrics = FolderMetrics(self.folder, CUTOFF_DATE, frozenset())
+        self.assertEqual(metrics.number_of_warnings, 2)
+        self.assertEqual([warning.secret for warning in metrics.warnings], [self.touched_only, self.whitelisted])
+
+    def test_warnings_are_immutable(self):
+        metrics = FolderMetrics(self.folder, CUTOFF_DATE, frozenset())
+        self.assertIsInstance(metrics.warnings, tuple)
+        self.assertIs(metrics.warnings, metrics.warnings)
+
+
+class TestCreateCsvPayload(TestCase):
+
+    def setUp(self):
+        self.password = SimpleNamespace(type='Password',
+                                        id='1',
+                                        name='database',
+                                        url='https://db.example.com',
+                                        username='admin',
+                                        password='secret',
+                                        last_modified_datetime=AFTER_CUTOFF,
+                                        last_touch_datetime=AFTER_CUTOFF + timedelta(days=1),
+                                        last_password_change_datetime=BEFORE_CUTOFF,
+                                        secret_updated_datetime=BEFORE_CUTOFF)
+        self.note = SimpleNamespace(type='SecureNote',
+                                    id='2',
+                                    name='recovery codes',
+                                    url='http://sn',
+                                    last_modified_datetime=AFTER_CUTOFF,
+                                    last_touch_datetime=AFTER_CUTOFF,
+                                    last_password_change_datetime=AFTER_CUTOFF,
+                                    secret_updated_datetime=AFTER_CUTOFF)
+        self.folders = [SimpleNamespace(full_path='Shared-Team', secrets=[self.password, self.note])]
+
+    def test_rows_line_up_with_header(self):
+        header, *rows = create_csv_payload(self.folders, CUTOFF_DATE, frozenset())
+        self.assertEqual([dict(zip(header, row)) for row in rows],
+                         [{'full_path': 'Shared-Team',
+                           'secret_type': 'Password',
+                           'id': '1',
+                           'name': 'database',
+                           'url': 'https://db.example.com',
+                           'username': 'admin',
+                           'last_modified': AFTER_CUTOFF,
+                           'last_touched': AFTER_CUTOFF + timedelta(days=1),
+                           'last_password_modified': BEFORE_CUTOFF,
+                           'status': 'NOT_OK',
+                           'warning': True},
+                          {'full_path': 'Shared-Team',
+                           'secret_type': 'SecureNote',
+                           'id': '2',
+                           'name': 'recovery codes',
+                           'url': 'http://sn',
+                           'username': 'SecureNote',
+                           'last_modified': AFTER_CUTOFF,
+                           'last_touched': AFTER_CUTOFF,
+                           'last_password_modified': AFTER_CUTOFF,
+                           'status': 'OK',
+                           'warning': False}])
+        for row in rows:
+            self.assertEqual(len(row), len(header))